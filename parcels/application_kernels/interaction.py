@@ -6,6 +6,10 @@ from parcels.tools.statuscodes import OperationCode, StateCode
 __all__ = ['AsymmetricAttraction', 'NearestNeighborWithinRange',
            'MergeWithNearestNeighbor']
 
+# Below this number of neighbors, reductions over the neighbors are done on
+# Python lists instead of NumPy arrays.
+_SCALAR_NEIGHBOR_THRESHOLD = 8
+
 
 def NearestNeighborWithinRange(particle, fieldset, time, neighbors, mutator):
     """Computes the nearest neighbor within range for each particle
@@ -13,23 +17,36 @@ def NearestNeighborWithinRange(particle, fieldset, time, neighbors, mutator):
     Particle has to have the nearest_neighbor property. If no particle
     is in range, set nearest_neighbor property to -1.
     """
-    min_dist = -1
     neighbor_id = -1
-    for n in neighbors:
-        # Note that with interacting particles p.surf_dist, p.depth_dist are
+    n_neighbors = len(neighbors)
+    if n_neighbors > 0:
+        # Note that with interacting particles p.horiz_dist, p.vert_dist are
         # automatically set to be the distance along the surface and
-        # z-direction respectively.
-        dist = np.sqrt(n.horiz_dist**2 + n.vert_dist**2)
+        # z-direction respectively. The squared distance has the same
+        # ordering as the distance itself, so no square root is needed.
+        horiz_dist = neighbors.getvardata('horiz_dist')
+        vert_dist = neighbors.getvardata('vert_dist')
+        ids = neighbors.getvardata('id')
         # Note that in case of a tie, the particle with the lowest ID
         # wins. In certain adverserial cases, this might lead to
         # undesirable results.
-        if dist < min_dist or min_dist < 0:
-            min_dist = dist
-            neighbor_id = n.id
-
-    def f(p, neighbor):
-        p.nearest_neighbor = neighbor
-    mutator[particle.id].append((f, [neighbor_id]))
+        if n_neighbors < _SCALAR_NEIGHBOR_THRESHOLD:
+            # For a handful of neighbors a plain Python reduction is cheaper
+            # than setting up the array operations.
+            dist2 = [h*h + v*v for h, v in zip(horiz_dist.tolist(), vert_dist.tolist())]
+            neighbor_id = min(zip(dist2, ids.tolist()))[1]
+        else:
+            # Only the minimum is needed, so reduce instead of sorting. The
+            # distances are squared in double precision, as in the scalar
+            # reduction above, so that both find the same neighbor.
+            horiz_dist = horiz_dist.astype(np.float64)
+            vert_dist = vert_dist.astype(np.float64)
+            dist2 = horiz_dist*horiz_dist
+            dist2 += vert_dist*vert_dist
+            i_min = dist2.argmin()
+            neighbor_id = int(ids[dist2 == dist2[i_min]].min())
+
+    mutator[particle.id].append((_set_nearest_neighbor, (neighbor_id,)))
 
     return StateCode.Success
 
@@ -42,28 +59,19 @@ def MergeWithNearestNeighbor(particle, fieldset, time, neighbors, mutator):
     properties. Only pairs of particles that have each other as nearest
     neighbors will be merged.
     """
-    def delete_particle(p):
-        p.state = OperationCode.Delete
-
-    def merge_with_neighbor(p, nlat, nlon, ndepth, nmass):
-        p.lat = (p.mass * p.lat + nmass * nlat) / (p.mass + nmass)
-        p.lon = (p.mass * p.lon + nmass * nlon) / (p.mass + nmass)
-        p.depth = (p.mass * p.depth + nmass * ndepth) / (p.mass + nmass)
-        p.mass = p.mass + nmass
-
-    for n in neighbors:
-        if n.id == particle.nearest_neighbor:
-            if n.nearest_neighbor == particle.id and particle.id < n.id:
-                # Merge particles:
-                # Delete neighbor
-                mutator[n.id].append((delete_particle, ()))
-                # Take position at the mid point and sum of masses
-                args = np.array([n.lat, n.lon, n.depth, n.mass])
-                mutator[particle.id].append((merge_with_neighbor, args))
-
-                return StateCode.Success
-            else:
-                return StateCode.Success
+    ids = neighbors.getvardata('id')
+    i_nearest = np.flatnonzero(ids == particle.nearest_neighbor)
+    if len(i_nearest) == 0:
+        return StateCode.Success
+
+    n = neighbors[i_nearest[0]]
+    if n.nearest_neighbor == particle.id and particle.id < n.id:
+        # Merge particles:
+        # Delete neighbor
+        mutator[n.id].append((_delete_particle, ()))
+        # Take position at the mid point and sum of masses
+        args = (n.lat, n.lon, n.depth, n.mass)
+        mutator[particle.id].append((_merge_with_neighbor, args))
 
     return StateCode.Success
 
@@ -76,30 +84,48 @@ def AsymmetricAttraction(particle, fieldset, time, neighbors, mutator):
     itself. Particles with attractor=False are only attracted to attractors.
     Works only properly on a flat mesh (because of vector calculations).
     """
-    na_neighbors = []
     if not particle.attractor:
         return StateCode.Success
-    for n in neighbors:
-        if n.attractor:
-            continue
-        na_neighbors.append(n)
 
+    # Only non-attractors are attracted; compute all their displacements at once.
+    na_mask = np.logical_not(neighbors.getvardata('attractor'))
+    ids = neighbors.getvardata('id')[na_mask]
+    dt = neighbors.getvardata('dt')[na_mask]
+    assert np.all(dt == particle.dt)
+    dlat = particle.lat-neighbors.getvardata('lat')[na_mask]
+    dlon = particle.lon-neighbors.getvardata('lon')[na_mask]
+    ddepth = particle.depth-neighbors.getvardata('depth')[na_mask]
+    dx_norm2 = dlat*dlat + dlon*dlon + ddepth*ddepth
+
+    # The velocity is velocity_param/|dx|**2 in the direction of dx, so the
+    # displacement over dt is dx scaled by velocity_param*dt/|dx|**3.
     velocity_param = 0.04
-    for n in na_neighbors:
-        assert n.dt == particle.dt
-        dx = np.array([particle.lat-n.lat, particle.lon-n.lon,
-                       particle.depth-n.depth])
-        dx_norm = np.linalg.norm(dx)
-        velocity = velocity_param/(dx_norm**2)
+    scale = velocity_param*dt/(dx_norm2*np.sqrt(dx_norm2))
 
-        distance = velocity*n.dt
-        d_vec = distance*dx/dx_norm
+    for n_id, d_vec in zip(ids, zip(scale*dlat, scale*dlon, scale*ddepth)):
+        mutator[n_id].append((_shift_position, d_vec))
 
-        def f(n, dlat, dlon, ddepth):
-            n.lat += dlat
-            n.lon += dlon
-            n.depth += ddepth
+    return StateCode.Success
 
-        mutator[n.id].append((f, d_vec))
 
-    return StateCode.Success
+# Mutator functions of the interaction kernels above. They are defined at
+# module level so that no new function objects are created for every particle.
+def _set_nearest_neighbor(p, neighbor):
+    p.nearest_neighbor = neighbor
+
+
+def _delete_particle(p):
+    p.state = OperationCode.Delete
+
+
+def _merge_with_neighbor(p, nlat, nlon, ndepth, nmass):
+    p.lat = (p.mass * p.lat + nmass * nlat) / (p.mass + nmass)
+    p.lon = (p.mass * p.lon + nmass * nlon) / (p.mass + nmass)
+    p.depth = (p.mass * p.depth + nmass * ndepth) / (p.mass + nmass)
+    p.mass = p.mass + nmass
+
+
+def _shift_position(p, dlat, dlon, ddepth):
+    p.lat += dlat
+    p.lon += dlon
+    p.depth += ddepth
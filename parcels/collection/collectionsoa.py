@@ -937,6 +937,15 @@ class ParticleCollectionIterableSOA(BaseParticleCollectionIterable):
         """Implementation needed for particle-particle interaction"""
         return ParticleAccessorSOA(self._pcoll_immutable, self._subset[items])
 
+    def getvardata(self, var):
+        """Implementation needed for particle-particle interaction
+
+        Returns the (contiguous) data array of a variable for all the
+        particles in the subset, so that interaction kernels can operate
+        on all neighbors at once instead of looping over them.
+        """
+        return self._pcoll_immutable.getvardata(var, self._subset)
+
 
 class ParticleCollectionIteratorSOA(BaseParticleCollectionIterator):
     """Iterator for looping over the particles in the ParticleCollection.
@@ -90,7 +90,8 @@ class InteractionKernelSOA(BaseInteractionKernel):
             mutator = defaultdict(lambda: [])
 
             # Loop only over particles that are in a positive state and have started.
-            for particle_idx in active_idx:
+            neighbors_iter = pset.neighbors_by_indices(active_idx)
+            for particle_idx, neighbors in zip(active_idx, neighbors_iter):
                 p = pset[particle_idx]
                 # Don't use particles that are not started.
                 if (endtime-p.time)/dt <= -1e-7:
@@ -99,7 +100,6 @@ class InteractionKernelSOA(BaseInteractionKernel):
                     p.dt = endtime-p.time
                     reset_particle_idx.append(particle_idx)
 
-                neighbors = pset.neighbors_by_index(particle_idx)
                 try:
                     res = pyfunc(p, pset.fieldset, p.time, neighbors, mutator)
                 except Exception as e:
@@ -111,15 +111,18 @@ class InteractionKernelSOA(BaseInteractionKernel):
                 if res != StateCode.Success:
                     logger.warning_once("Some InteractionKernel was not completed succesfully, likely because a Particle threw an error that was not captured.")
 
-            for particle_idx in active_idx:
+            # Only create particle accessors for particles with mutations.
+            active_ids = pset.collection.data['id'][active_idx]
+            for particle_idx, particle_id in zip(active_idx, active_ids):
+                if particle_id not in mutator:
+                    continue
                 p = pset[particle_idx]
                 try:
-                    for mutator_func, args in mutator[p.id]:
+                    for mutator_func, args in mutator[particle_id]:
                         mutator_func(p, *args)
                 except KeyError:
                     pass
-            for particle_idx in reset_particle_idx:
-                pset[particle_idx].dt = dt
+            pset.collection.data['dt'][reset_particle_idx] = dt
 
     def execute(self, pset, endtime, dt, recovery=None, output_file=None, execute_once=False):
         """Execute this Kernel over a ParticleSet for several timesteps
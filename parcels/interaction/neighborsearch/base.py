@@ -2,7 +2,10 @@ from abc import ABC, abstractmethod
 
 import numpy as np
 
-from parcels.interaction.neighborsearch.distanceutils import spherical_distance
+from parcels.interaction.neighborsearch.distanceutils import (
+    fast_spherical_distance,
+    trig_coordinates,
+)
 
 
 class BaseNeighborSearch(ABC):
@@ -59,6 +62,33 @@ class BaseNeighborSearch(ABC):
         coor = self._values[:, particle_idx].reshape(3, 1)
         return self.find_neighbors_by_coor(coor)
 
+    def find_neighbors_by_coors(self, coors):
+        '''Get the neighbors around multiple locations.
+
+        This is a default implementation that lazily queries the locations
+        one by one. Data structures that support batched queries can
+        provide a faster implementation.
+
+        :param coors: Numpy array ([depth, lat, lon], n_locations).
+        :returns Iterable with the result of find_neighbors_by_coor for each
+                 location.
+        '''
+        return (self.find_neighbors_by_coor(coors[:, i])
+                for i in range(coors.shape[1]))
+
+    def find_neighbors_by_idxs(self, particle_idxs):
+        '''Get the neighbors around multiple particles.
+
+        This is a default implementation that lazily queries the particles
+        one by one.
+
+        :param particle_idxs: indices of the particles (SoA).
+        :returns Iterable with the result of find_neighbors_by_idx for each
+                 particle.
+        '''
+        return (self.find_neighbors_by_idx(particle_idx)
+                for particle_idx in particle_idxs)
+
     def update_values(self, new_values, new_active_mask=None):
         '''Update the coordinates of the particles.
 
@@ -159,31 +189,40 @@ class BaseFlatNeighborSearch(BaseNeighborSearch):
 
 class BaseSphericalNeighborSearch(BaseNeighborSearch):
     "Base class for a neighbor search with a spherical mesh."
+    _trig_values = None
+
+    def update_values(self, new_values, new_active_mask=None):
+        self._trig_values = None
+        super().update_values(new_values, new_active_mask=new_active_mask)
+
+    def rebuild(self, values, active_mask=-1):
+        self._trig_values = None
+        super().rebuild(values, active_mask)
+
+    def _particle_trig(self):
+        """Sines and cosines of the latitudes and longitudes of the particles.
+
+        They are only recomputed after the particle coordinates are updated,
+        instead of for every distance computation.
+        """
+        if self._trig_values is None:
+            self._trig_values = trig_coordinates(self._values[1], self._values[2])
+        return self._trig_values
+
     def _distance(self, coor, subset_idx):
-        vert_distances, horiz_distances = spherical_distance(
-            *coor,
-            self._values[0, subset_idx],
-            self._values[1, subset_idx],
-            self._values[2, subset_idx],
-        )
+        coor = coor.reshape(3, 1)
+        trig = tuple(t[subset_idx] for t in self._particle_trig())
+        vert_distances = np.abs(self._values[0, subset_idx]-coor[0])
+        horiz_distances = fast_spherical_distance(coor[1], coor[2], trig)
 
         if self.periodic_domain_zonal:
             # If zonal periodic boundaries
-            coor[2, 0] -= self.periodic_domain_zonal
             # distance through Western boundary
-            hd2 = spherical_distance(
-                *coor,
-                self._values[0, subset_idx],
-                self._values[1, subset_idx],
-                self._values[2, subset_idx])[1]
-            coor[2, 0] += 2*self.periodic_domain_zonal
+            hd2 = fast_spherical_distance(
+                coor[1], coor[2]-self.periodic_domain_zonal, trig)
             # distance through Eastern boundary
-            hd3 = spherical_distance(
-                *coor,
-                self._values[0, subset_idx],
-                self._values[1, subset_idx],
-                self._values[2, subset_idx])[1]
-            coor[2, 0] -= self.periodic_domain_zonal
+            hd3 = fast_spherical_distance(
+                coor[1], coor[2]+self.periodic_domain_zonal, trig)
         else:
             hd2 = np.full(len(horiz_distances), np.inf)
             hd3 = np.full(len(horiz_distances), np.inf)
@@ -1,5 +1,7 @@
 import numpy as np
 
+R_earth = 6371000
+
 
 def fast_distance(lat1, lon1, lat2, lon2):
     '''Compute the arc distance assuming the earth is a sphere.
@@ -14,7 +16,6 @@ def fast_distance(lat1, lon1, lat2, lon2):
 def spherical_distance(depth1_m, lat1_deg, lon1_deg, depth2_m, lat2_deg,
                        lon2_deg):
     "Compute the arc distance, uses degrees as input."
-    R_earth = 6371000
     lat1 = np.pi*lat1_deg/180
     lon1 = np.pi*lon1_deg/180
     lat2 = np.pi*lat2_deg/180
@@ -24,3 +25,25 @@ def spherical_distance(depth1_m, lat1_deg, lon1_deg, depth2_m, lat2_deg,
 
     vert_dist = np.abs(depth1_m-depth2_m)
     return (vert_dist, horiz_dist)
+
+
+def trig_coordinates(lat_deg, lon_deg):
+    "Sines and cosines of latitudes and longitudes given in degrees."
+    lat = np.pi*lat_deg/180
+    lon = np.pi*lon_deg/180
+    return (np.sin(lat), np.cos(lat), np.sin(lon), np.cos(lon))
+
+
+def fast_spherical_distance(lat1_deg, lon1_deg, trig2):
+    '''Compute the horizontal arc distance to many coordinates at once.
+
+    Same as the horizontal distance of spherical_distance, but with the
+    sines and cosines of the second set of coordinates precomputed with
+    trig_coordinates, so that they can be reused between calls.
+    '''
+    sin_lat1, cos_lat1, sin_lon1, cos_lon1 = trig_coordinates(lat1_deg, lon1_deg)
+    sin_lat2, cos_lat2, sin_lon2, cos_lon2 = trig2
+    # cos(lon1-lon2) = cos(lon1)*cos(lon2) + sin(lon1)*sin(lon2)
+    cos_dlon = cos_lon1*cos_lon2 + sin_lon1*sin_lon2
+    g = sin_lat1*sin_lat2 + cos_lat1*cos_lat2*cos_dlon
+    return R_earth*np.arccos(np.minimum(1, g))
@@ -25,6 +25,12 @@ class HashSphericalNeighborSearch(BaseHashNeighborSearch,
 
         self._init_structure()
 
+    def update_values(self, new_values, new_active_mask=None):
+        # The hashtable update does not pass through the spherical base
+        # class, so reset the sines and cosines of the particles here.
+        self._trig_values = None
+        super().update_values(new_values, new_active_mask=new_active_mask)
+
     def _find_neighbors(self, hash_id, coor):
         '''Get neighbors from hash_id and location.'''
         # Get the neighboring cells.
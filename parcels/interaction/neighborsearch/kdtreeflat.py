@@ -1,18 +1,113 @@
 import numpy as np
-from scipy.spatial import KDTree
+from scipy.spatial import cKDTree
 
 from parcels.interaction.neighborsearch.base import BaseFlatNeighborSearch
 
 
 class KDTreeFlatNeighborSearch(BaseFlatNeighborSearch):
+    '''Neighbor search using a KD-tree.
+
+    Since particles move only a little between timesteps, the tree is not
+    rebuilt on every update. Instead, the search radius is enlarged by the
+    maximum displacement of the particles since the tree was built, and the
+    results are filtered with the current positions of the particles.
+    '''
+    def __init__(self, inter_dist_vert, inter_dist_horiz,
+                 max_depth=100000, periodic_domain_zonal=None,
+                 rebuild_interval=20, max_displacement=0.2):
+        '''Initialize the neighbor data structure.
+
+        :param rebuild_interval: maximum number of updates before the tree
+                                 is rebuilt.
+        :param max_displacement: maximum displacement of the particles
+                                 since the last rebuild, relative to the
+                                 interaction distance, before the tree is
+                                 rebuilt.
+        '''
+        super().__init__(inter_dist_vert, inter_dist_horiz,
+                         max_depth=max_depth,
+                         periodic_domain_zonal=periodic_domain_zonal)
+        self.rebuild_interval = rebuild_interval
+        self.max_displacement = max_displacement
+        # Multiply by the inverse instead of dividing on every query.
+        self._inv_inter_dist = 1/self.inter_dist
+        self._kdtree = None
+        self._n_updates = 0  # Number of updates since the last rebuild.
+        self._displacement = 0  # Maximum displacement since the last rebuild.
+
     def find_neighbors_by_coor(self, coor):
         coor = coor.reshape(3, 1)
-        corrected_coor = (coor/self.inter_dist).reshape(-1)
-        rel_idx = np.array(self._kdtree.query_ball_point(corrected_coor, r=1))
-        neighbor_idx = self.active_idx[rel_idx]
-        return neighbor_idx, np.vstack(self._distance(coor, neighbor_idx))
+        corrected_coor = (coor*self._inv_inter_dist).reshape(-1)
+        rel_idx = self._kdtree.query_ball_point(
+            corrected_coor, r=1+self._displacement, return_sorted=False)
+        return self._filter_candidates(coor, rel_idx)
+
+    def find_neighbors_by_coors(self, coors):
+        # Query all locations in a single (parallel) traversal of the tree.
+        corrected_coors = (coors*self._inv_inter_dist).T
+        rel_idx_list = self._kdtree.query_ball_point(
+            corrected_coors, r=1+self._displacement, workers=-1,
+            return_sorted=False)
+        return [self._filter_candidates(coors[:, i].reshape(3, 1), rel_idx)
+                for i, rel_idx in enumerate(rel_idx_list)]
+
+    def find_neighbors_by_idxs(self, particle_idxs):
+        return self.find_neighbors_by_coors(self._values[:, particle_idxs])
+
+    def _filter_candidates(self, coor, rel_idx):
+        '''Remove candidates that are inactive or out of range.'''
+        # Index directly with the list returned by the tree, which avoids
+        # an intermediate array.
+        candidate_idx = self._active_idx[rel_idx]
+        candidate_idx = candidate_idx[self._active_mask[candidate_idx]]
+        return self._get_close_neighbor_dist(coor, candidate_idx)
+
+    def update_values(self, new_values, new_active_mask=None):
+        if not self._check_tree(new_values, new_active_mask):
+            self.rebuild(new_values, new_active_mask)
+            return
+
+        self._values = new_values
+        if new_active_mask is None:
+            new_active_mask = np.full(new_values.shape[1], True)
+        self._active_mask = new_active_mask
+        self._n_updates += 1
+
+    def _check_tree(self, new_values, new_active_mask):
+        """Check whether the tree can still be used for the new values.
+
+        As a side effect, the maximum displacement is updated.
+
+        :param new_values: New particle coordinates (depth, lat, lon) to be checked.
+        :param new_active_mask: New active mask for the particles.
+        :returns True if the tree can be reused, False if not.
+        """
+        if self._kdtree is None or self._n_updates >= self.rebuild_interval:
+            return False
+        if new_values.shape != self._values.shape:
+            return False
+
+        # Particles that were activated are not in the tree.
+        if new_active_mask is None:
+            new_active_mask = np.full(new_values.shape[1], True)
+        tree_mask = np.zeros(new_values.shape[1], dtype=bool)
+        tree_mask[self._active_idx] = True
+        if np.any(new_active_mask & ~tree_mask):
+            return False
+
+        displacement = new_values[:, self._active_idx]*self._inv_inter_dist - self._corrected_values
+        displacement = np.sqrt(np.max(np.sum(displacement**2, axis=0), initial=0))
+        # Also rebuild if the displacement is NaN.
+        if not displacement <= self.max_displacement:
+            return False
+        self._displacement = displacement
+        return True
 
-    def rebuild(self, values=None, active_mask=-1):
+    def rebuild(self, values, active_mask=-1):
         super().rebuild(values, active_mask)
-        self._corrected_values = values[:, self._active_idx]/self.inter_dist
-        self._kdtree = KDTree(self._corrected_values.T)
+        if self._active_mask is None:
+            self._active_mask = np.full(self._values.shape[1], True)
+        self._corrected_values = self._values[:, self._active_idx]*self._inv_inter_dist
+        self._kdtree = cKDTree(self._corrected_values.T)
+        self._n_updates = 0
+        self._displacement = 0
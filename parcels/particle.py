@@ -1,4 +1,6 @@
+import weakref
 from ctypes import c_void_p
+from functools import cached_property
 from operator import attrgetter
 
 import numpy as np
@@ -28,20 +30,22 @@ class Variable:
         self.dtype = dtype
         self.initial = initial
         self.to_write = to_write
+        # Name of the instance attribute holding the value in SciPy mode
+        self._attr_name = "_%s" % name
 
     def __get__(self, instance, cls):
         if instance is None:
             return self
         if issubclass(cls, JITParticle):
-            return instance._cptr.__getitem__(self.name)
+            return instance._cptr[self.name]
         else:
-            return getattr(instance, "_%s" % self.name, self.initial)
+            return getattr(instance, self._attr_name, self.initial)
 
     def __set__(self, instance, value):
         if isinstance(instance, JITParticle):
-            instance._cptr.__setitem__(self.name, value)
+            instance._cptr[self.name] = value
         else:
-            setattr(instance, "_%s" % self.name, value)
+            setattr(instance, self._attr_name, value)
 
     def __repr__(self):
         return f"PVar<{self.name}|{self.dtype}>"
@@ -70,8 +74,9 @@ class ParticleType:
             if issubclass(cls, ScipyParticle):
                 # Add inherited particle variables
                 ptype = cls.getPType()
+                inherited_names = {v.name for v in ptype.variables}
                 for v in self.variables:
-                    if v.name in [v.name for v in ptype.variables]:
+                    if v.name in inherited_names:
                         raise AttributeError(
                             f"Custom Variable name '{v.name}' is not allowed, as it is also a built-in variable")
                     if v.name == 'z':
@@ -79,8 +84,8 @@ class ParticleType:
                             "Custom Variable name 'z' is not allowed, as it is used for depth in ParticleFile")
                 self.variables = ptype.variables + self.variables
         # Sort variables with all the 64-bit first so that they are aligned for the JIT cptr
-        self.variables = [v for v in self.variables if v.is64bit()] + \
-                         [v for v in self.variables if not v.is64bit()]
+        # (the sort is stable, so the order within both groups is kept)
+        self.variables = sorted(self.variables, key=lambda v: not v.is64bit())
 
     def __repr__(self):
         return f"PType<{self.name}>::{self.variables}"
@@ -94,7 +99,7 @@ class ParticleType:
     def _cache_key(self):
         return "-".join([f"{v.name}:{v.dtype}" for v in self.variables])
 
-    @property
+    @cached_property
     def dtype(self):
         """Numpy.dtype object that defines the C struct"""
         type_list = [(v.name, v.dtype) for v in self.variables]
@@ -124,6 +129,9 @@ class ParticleType:
 class _Particle:
     """Private base class for all particle types"""
     lastID = 0  # class-level variable keeping track of last Particle ID used
+    # Cache of the ParticleType of each particle class. Weak references, so
+    # that the particle classes created for every ParticleSet can be freed.
+    _ptype_cache = weakref.WeakKeyDictionary()
 
     def __init__(self):
         ptype = self.getPType()
@@ -157,7 +165,11 @@ class _Particle:
 
     @classmethod
     def getPType(cls):
-        return ParticleType(cls)
+        ptype = _Particle._ptype_cache.get(cls)
+        if ptype is None:
+            ptype = ParticleType(cls)
+            _Particle._ptype_cache[cls] = ptype
+        return ptype
 
     @classmethod
     def getInitialValue(cls, ptype, name):
@@ -219,6 +231,10 @@ class ScipyParticle(_Particle):
 
     @classmethod
     def set_lonlatdepth_dtype(cls, dtype):
+        if cls.lon.dtype != dtype:
+            # The Variables are shared by all particle classes, so all
+            # cached ParticleTypes are outdated
+            _Particle._ptype_cache.clear()
         cls.lon.dtype = dtype
         cls.lat.dtype = dtype
         cls.depth.dtype = dtype
@@ -487,10 +487,27 @@ class ParticleSetSOA(BaseParticleSet):
     def neighbors_by_index(self, particle_idx):
         neighbor_idx, distances = self._neighbor_tree.find_neighbors_by_idx(
             particle_idx)
+        return self._neighbors_iterable(particle_idx, neighbor_idx, distances)
+
+    def neighbors_by_indices(self, particle_idxs, chunk_size=1024):
+        """Iterate over the neighbors of multiple particles.
+
+        The neighbor search is done for chunks of chunk_size particles at
+        once, which bounds the memory used for the search results. The
+        distances are only stored when the neighbors of a particle are
+        requested from the generator.
+        """
+        for start in range(0, len(particle_idxs), chunk_size):
+            chunk_idxs = particle_idxs[start:start+chunk_size]
+            results = self._neighbor_tree.find_neighbors_by_idxs(chunk_idxs)
+            for particle_idx, (neighbor_idx, distances) in zip(chunk_idxs, results):
+                yield self._neighbors_iterable(particle_idx, neighbor_idx, distances)
+
+    def _neighbors_iterable(self, particle_idx, neighbor_idx, distances):
         neighbor_idx = self._active_particle_idx[neighbor_idx]
         mask = (neighbor_idx != particle_idx)
         neighbor_idx = neighbor_idx[mask]
-        if 'horiz_dist' in self._collection._ptype.variables:
+        if 'horiz_dist' in self._collection._data:
             self._collection.data['vert_dist'][neighbor_idx] = distances[0, mask]
             self._collection.data['horiz_dist'][neighbor_idx] = distances[1, mask]
         return ParticleCollectionIterableSOA(self._collection, subset=neighbor_idx)
@@ -1,5 +1,6 @@
 """Collection of pre-built recovery kernels"""
 
+from enum import IntEnum
 
 __all__ = ['StateCode', 'OperationCode', 'ErrorCode',
            'FieldSamplingError', 'FieldOutOfBoundError', 'TimeExtrapolationError',
@@ -7,18 +8,18 @@ __all__ = ['StateCode', 'OperationCode', 'ErrorCode',
            'recovery_map']
 
 
-class StateCode:
+class StateCode(IntEnum):
     Success = 0
     Evaluate = 1
 
 
-class OperationCode:
+class OperationCode(IntEnum):
     Repeat = 2
     Delete = 3
     StopExecution = 4
 
 
-class ErrorCode:
+class ErrorCode(IntEnum):
     Error = 5
     ErrorInterpolation = 51
     ErrorOutOfBounds = 6
@@ -1,3 +1,6 @@
+from collections import defaultdict
+from types import SimpleNamespace
+
 import numpy as np
 import pytest
 
@@ -13,6 +16,10 @@ from parcels.particle import ScipyInteractionParticle, ScipyParticle, Variable
 ptype = {'scipy': ScipyInteractionParticle, 'jit': JITParticle}
 
 
+def BoostLat(p):
+    p.lat += 0.1
+
+
 def DummyMoveNeighbor(particle, fieldset, time, neighbors, mutator):
     """A particle boosts the movement of its nearest neighbor, by adding
     0.1 to its lat position.
@@ -20,14 +27,13 @@ def DummyMoveNeighbor(particle, fieldset, time, neighbors, mutator):
     if len(neighbors) == 0:
         return StateCode.Success
 
-    distances = [np.sqrt(n.vert_dist**2 + n.horiz_dist**2) for n in neighbors]
-    i_min_dist = np.argmin(distances)
-
-    def f(p):
-        p.lat += 0.1
+    # Squared distances suffice to find the nearest neighbor.
+    vert_dist = neighbors.getvardata('vert_dist')
+    horiz_dist = neighbors.getvardata('horiz_dist')
+    i_min_dist = int(np.argmin(vert_dist*vert_dist + horiz_dist*horiz_dist))
 
     neighbor_id = neighbors[i_min_dist].id
-    mutator[neighbor_id].append((f, ()))
+    mutator[neighbor_id].append((BoostLat, ()))
 
     return StateCode.Success
 
@@ -139,19 +145,117 @@ def test_neighbor_merge(fieldset, mode):
     assert len(pset) == 1
 
 
+@pytest.mark.parametrize('mode', ['scipy'])
+@pytest.mark.parametrize('n_extra', [0, 10])
+def test_nearest_neighbor_tie(fieldset, mode, n_extra):
+    # Extra particles are further away from the first particle, but still
+    # in range, so that both the scalar and array reductions are tested.
+    lons = [0.25, 0.0, 0.5] + [0.25]*n_extra
+    lats = [0.0, 0.0, 0.0] + list(np.linspace(0.26, 0.29, n_extra))
+    # The IDs decrease with the index, so that the lowest ID is not the
+    # first particle in the set.
+    pid_orig = np.arange(len(lons))[::-1]
+    # Distance in meters R_earth*0.3 degrees
+    interaction_distance = 6371000*0.3*np.pi/180
+    pset = ParticleSet(fieldset, pclass=MergeParticle, lon=lons, lat=lats,
+                       pid_orig=pid_orig, interaction_distance=interaction_distance)
+    assert pset.id[2] < pset.id[1]
+    pset.execute(DoNothing, pyfunc_inter=NearestNeighborWithinRange,
+                 endtime=1., dt=1.)
+    # Both neighbors of the first particle are equally far away, so the one
+    # with the lowest ID wins.
+    assert np.all(pset.nearest_neighbor[:3] == pset.id[[2, 0, 0]])
+
+
+class NeighborData:
+    """Minimal stand-in for the neighbors that are passed to interaction kernels"""
+
+    def __init__(self, **data):
+        self._data = {var: np.asarray(val) for var, val in data.items()}
+
+    def __len__(self):
+        return len(self._data['id'])
+
+    def getvardata(self, var):
+        return self._data[var]
+
+
+@pytest.mark.parametrize('n_far', [0, 10])
+def test_nearest_neighbor_precision(n_far):
+    # The squared distances of both close neighbors are equal in single
+    # precision, but not in double precision. The result should not depend
+    # on the number of neighbors.
+    horiz_dist = np.array([18600, 18600] + [30000]*n_far, dtype=np.float32)
+    vert_dist = np.array([8, 7] + [0]*n_far, dtype=np.float32)
+    ids = np.arange(2+n_far, dtype=np.int64)
+    neighbors = NeighborData(horiz_dist=horiz_dist, vert_dist=vert_dist, id=ids)
+    particle = SimpleNamespace(id=2+n_far)
+    mutator = defaultdict(lambda: [])
+    NearestNeighborWithinRange(particle, None, 0, neighbors, mutator)
+    (_, (neighbor_id,)), = mutator[particle.id]
+    assert neighbor_id == 1
+
+
+@pytest.mark.parametrize('mode', ['scipy'])
+@pytest.mark.parametrize('npart', [4, 20])
+def test_nearest_neighbor(mode, npart):
+    # With more particles, each has more neighbors than the threshold for
+    # the scalar reduction. The spacing increases with longitude, so there
+    # are no ties.
+    lons = (np.arange(npart)/npart)**2
+    lats = np.zeros(npart)
+    pset = ParticleSet(fieldset(mesh='flat'), pclass=MergeParticle, lon=lons, lat=lats,
+                       interaction_distance=2)
+    pset.execute(DoNothing, pyfunc_inter=NearestNeighborWithinRange,
+                 endtime=1., dt=1.)
+    dist = np.abs(lons[:, None] - lons[None, :])
+    np.fill_diagonal(dist, np.inf)
+    assert np.all(pset.nearest_neighbor == pset.id[np.argmin(dist, axis=1)])
+
+
+@pytest.mark.parametrize('mesh', ['spherical', 'flat'])
+def test_neighbors_by_indices(mesh):
+    np.random.seed(1928374)
+    npart = 50
+    interaction_distance = 0.2 if mesh == 'flat' else 6371000*0.2*np.pi/180
+    pset = ParticleSet(fieldset(mesh=mesh), pclass=ScipyInteractionParticle,
+                       lon=np.random.rand(npart), lat=np.random.rand(npart),
+                       interaction_distance=interaction_distance)
+    pset.compute_neighbor_tree(0, 1)
+    particle_idxs = np.arange(npart)
+    # The chunk size does not divide the number of particles.
+    neighbors_iter = pset.neighbors_by_indices(particle_idxs, chunk_size=7)
+    n_yielded = 0
+    for particle_idx, neighbors in zip(particle_idxs, neighbors_iter):
+        ids = neighbors.getvardata('id')
+        horiz_dist = neighbors.getvardata('horiz_dist')
+        ref_neighbors = pset.neighbors_by_index(particle_idx)
+        ref_ids = ref_neighbors.getvardata('id')
+        assert np.all(np.sort(ids) == np.sort(ref_ids))
+        assert np.allclose(horiz_dist[np.argsort(ids)],
+                           ref_neighbors.getvardata('horiz_dist')[np.argsort(ref_ids)])
+        n_yielded += 1
+    assert n_yielded == npart
+
+
 class AttractingParticle(ScipyInteractionParticle):
     attractor = Variable('attractor', dtype=np.bool_, to_write='once')
 
 
+class IntAttractingParticle(ScipyInteractionParticle):
+    attractor = Variable('attractor', dtype=np.int32, to_write='once')
+
+
 @pytest.mark.parametrize('mode', ['scipy'])
-def test_asymmetric_attraction(fieldset, mode):
+@pytest.mark.parametrize('pclass', [AttractingParticle, IntAttractingParticle])
+def test_asymmetric_attraction(fieldset, mode, pclass):
     lons = [0.0, 0.1, 0.2]
     lats = [0.0, 0.0, 0.0]
     # Distance in meters R_earth*0.2 degrees
     interaction_distance = 6371000*5.5*np.pi/180
-    pset = ParticleSet(fieldset, pclass=AttractingParticle, lon=lons, lat=lats,
+    pset = ParticleSet(fieldset, pclass=pclass, lon=lons, lat=lats,
                        interaction_distance=interaction_distance,
-                       attractor=[True, False, False])
+                       attractor=[1, 0, 0])
     pyfunc_inter = pset.InteractionKernel(AsymmetricAttraction)
     pset.execute(DoNothing,
                  pyfunc_inter=pyfunc_inter, runtime=3., dt=1.)
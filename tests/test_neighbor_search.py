@@ -9,6 +9,11 @@ from parcels.interaction.neighborsearch import (
     KDTreeFlatNeighborSearch,
 )
 from parcels.interaction.neighborsearch.basehash import BaseHashNeighborSearch
+from parcels.interaction.neighborsearch.distanceutils import (
+    fast_spherical_distance,
+    spherical_distance,
+    trig_coordinates,
+)
 
 
 def compare_results_by_idx(instance, particle_idx, ref_result, active_idx=None):
@@ -48,6 +53,28 @@ def test_flat_neighbors(test_class):
         compare_results_by_idx(test_instance, particle_idx, ref_result)
 
 
+@pytest.mark.parametrize(
+    "test_class", [KDTreeFlatNeighborSearch, HashFlatNeighborSearch,
+                   BruteFlatNeighborSearch])
+def test_flat_neighbors_batched(test_class):
+    np.random.seed(2384756)
+    n_particle = 1000
+    positions = np.random.rand(n_particle*3).reshape(3, n_particle)
+    test_instance = test_class(inter_dist_vert=0.3, inter_dist_horiz=0.3)
+    test_instance.rebuild(positions)
+
+    particle_idxs = np.random.choice(positions.shape[1], 100, replace=False)
+    results = list(test_instance.find_neighbors_by_idxs(particle_idxs))
+    assert len(results) == len(particle_idxs)
+    for particle_idx, (cur_neigh, cur_dist) in zip(particle_idxs, results):
+        ref_neigh, ref_dist = test_instance.find_neighbors_by_idx(particle_idx)
+        assert isinstance(cur_neigh, np.ndarray)
+        ref_order = np.argsort(ref_neigh)
+        cur_order = np.argsort(cur_neigh)
+        assert np.all(cur_neigh[cur_order] == ref_neigh[ref_order])
+        assert np.allclose(cur_dist[:, cur_order], ref_dist[:, ref_order])
+
+
 def create_spherical_positions(n_particles, max_depth=100000):
     yrange = 2*np.random.rand(n_particles)
     lat = 180*(np.arccos(1-yrange)-0.5*np.pi)/np.pi
@@ -110,9 +137,51 @@ def test_flat_update(test_class):
                                    active_idx=active_idx)
 
 
+def test_kdtree_small_update():
+    np.random.seed(1287364)
+    n_particle = 1000
+    n_test_particle = 10
+    ref_instance = BruteFlatNeighborSearch(inter_dist_vert=0.3, inter_dist_horiz=0.3)
+    test_instance = KDTreeFlatNeighborSearch(inter_dist_vert=0.3, inter_dist_horiz=0.3)
+
+    positions = create_flat_positions(n_particle)
+    active_mask = np.full(n_particle, True)
+    n_reused = 0
+    for i in range(30):
+        # Particles move a little and some are deactivated.
+        positions = positions + 0.01*(np.random.rand(3, n_particle) - 0.5)
+        if i > 0:
+            active_mask = np.logical_and(active_mask, np.random.rand(n_particle) > 0.02)
+        ref_instance.update_values(positions, active_mask)
+        test_instance.update_values(positions, active_mask)
+        if test_instance._n_updates > 0:
+            n_reused += 1
+        active_idx = np.where(active_mask)[0]
+        test_particles = np.random.choice(active_idx, size=n_test_particle, replace=False)
+        for particle_idx in test_particles:
+            ref_result, _ = ref_instance.find_neighbors_by_idx(particle_idx)
+            compare_results_by_idx(test_instance, particle_idx, ref_result,
+                                   active_idx=active_idx)
+    assert n_reused > 0
+
+
+def test_kdtree_nan_update():
+    positions = np.zeros((3, 3))
+    positions[2] = [0, 0.1, 0.2]
+    test_instance = KDTreeFlatNeighborSearch(inter_dist_vert=0.3, inter_dist_horiz=0.3)
+    test_instance.update_values(positions)
+    positions = positions.copy()
+    positions[1, 2] = np.nan
+    # The tree cannot be built with NaN coordinates, so it should not be
+    # reused either.
+    with pytest.raises(ValueError):
+        test_instance.update_values(positions)
+
+
 @pytest.mark.parametrize(
     "test_class", [BruteSphericalNeighborSearch, HashSphericalNeighborSearch])
-def test_spherical_update(test_class):
+@pytest.mark.parametrize("in_place", [False, True])
+def test_spherical_update(test_class, in_place):
     np.random.seed(9182741)
     n_particle = 1000
     n_test_particle = 10
@@ -122,10 +191,15 @@ def test_spherical_update(test_class):
     ref_instance = ref_class(inter_dist_vert=100000, inter_dist_horiz=1000000)
     test_instance = test_class(inter_dist_vert=100000, inter_dist_horiz=1000000)
 
+    positions = create_spherical_positions(n_particle)
     for _ in range(n_active_mask):
-        positions = create_spherical_positions(n_particle)
+        if in_place:
+            # Update the same array that was passed before.
+            positions[:] = create_spherical_positions(n_particle)
+        else:
+            positions = create_spherical_positions(n_particle)
         active_mask = np.random.rand(n_particle) > 0.5
-        ref_instance.update_values(positions, active_mask)
+        ref_instance.update_values(positions.copy(), active_mask)
         test_instance.update_values(positions, active_mask)
 
         active_idx = np.where(active_mask)[0]
@@ -136,3 +210,12 @@ def test_spherical_update(test_class):
         for particle_idx in test_particles:
             ref_result, _ = ref_instance.find_neighbors_by_idx(particle_idx)
             compare_results_by_idx(test_instance, particle_idx, ref_result, active_idx=active_idx)
+
+
+def test_fast_spherical_distance():
+    np.random.seed(1923874)
+    positions = create_spherical_positions(1000)
+    coor = create_spherical_positions(1)
+    trig = trig_coordinates(positions[1], positions[2])
+    ref_dist = spherical_distance(*coor, *positions)[1]
+    assert np.allclose(fast_spherical_distance(coor[1], coor[2], trig), ref_dist)
@@ -1,3 +1,4 @@
+import gc
 from operator import attrgetter
 
 import numpy as np
@@ -124,3 +125,42 @@ def test_variable_init_relative(fieldset, pset_mode, mode, coord_type, npart=10)
     assert np.allclose([p.p_relative for p in pset], 10., rtol=1e-12)
     assert np.allclose([p.p_lon for p in pset], lon, rtol=1e-12)
     assert np.allclose([p.p_lat for p in pset], lat, rtol=1e-12)
+
+
+@pytest.mark.parametrize('mode', ['scipy', 'jit'])
+def test_ptype_cache(mode):
+    """Test that the ParticleType is cached and updated when the lon/lat/depth dtype changes"""
+    class TestParticle(ptype[mode]):
+        p = Variable('p', dtype=np.float32)
+
+    lonlatdepth_dtype = TestParticle.lon.dtype
+    TestParticle.set_lonlatdepth_dtype(np.float32)
+    ptype_cached = TestParticle.getPType()
+    assert TestParticle.getPType() is ptype_cached
+
+    try:
+        TestParticle.set_lonlatdepth_dtype(np.float64)
+        ptype_float64 = TestParticle.getPType()
+        assert ptype_float64 is not ptype_cached
+        assert ptype_float64.dtype['lon'] == np.float64
+        # 64-bit variables are sorted first
+        assert [v.name for v in ptype_float64.variables].index('lon') < \
+            [v.name for v in ptype_float64.variables].index('p')
+        TestParticle.set_lonlatdepth_dtype(np.float32)
+        assert TestParticle.getPType().dtype['lon'] == np.float32
+    finally:
+        TestParticle.set_lonlatdepth_dtype(lonlatdepth_dtype)
+
+
+@pytest.mark.parametrize('pset_mode', pset_modes)
+@pytest.mark.parametrize('mode', ['scipy', 'jit'])
+def test_ptype_cache_pset(fieldset, pset_mode, mode):
+    """Test that the ParticleTypes of deleted ParticleSets are not kept in the cache"""
+    def cache_size_after(n_psets):
+        for _ in range(n_psets):
+            pset = pset_type[pset_mode]['pset'](fieldset, pclass=ptype[mode], lon=[0.5], lat=[0.5])
+            del pset
+        gc.collect()
+        return len(ptype[mode]._ptype_cache)
+
+    assert cache_size_after(20) == cache_size_after(1)